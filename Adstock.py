@@ -1,20 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import plotly.graph_objects as go
 # Import custom functions
 from mmm_functions import *
 
-# -------------------------- TOP OF PAGE INFORMATION -------------------------
-
-# Set browser / tab config
-st.set_page_config(
-    page_title="MMM App - Adstock Transformations",
-    page_icon="🧊",
-)
+# -------------------------- PAGE TEXT -------------------------
 
-# Give some context for what the page displays
-st.title('Adstock Transformations')
-st.markdown("This page demonstrates the effect of various adstock \
+# Long markdown blocks are defined once here rather than inline in each view
+PAGE_INTRO_MD = "This page demonstrates the effect of various adstock \
             transformations on a variable.  \nFor these examples, let's imagine \
             that we have _some variable that represents a quantity of a particlar_ \
             _advertising channel_.  \n\nFor example, this could be the number of impressions\
@@ -27,102 +21,214 @@ st.markdown("This page demonstrates the effect of various adstock \
             \n\n :green[So, at the start of our example (_Week 1_), we may have the impact of **0 Gross Rating Points (TV viewership metric)**, \
             but 7 weeks later those TV ads might reach their full impact of **100 Gross Rating Points**.]\
             \n\n**_:violet[We will use this starting value of 100 for all of our adstock examples]_**. \
-            ")
+            "
 
-st.markdown("**Reminder:** \n \
+DECAY_REMINDER_MD = "**Reminder:** \n \
 - Geometric adstock transformations have **_:red[fixed decay]_**  \n\
-- Weibull adstock transformations have **_:red[flexible decay]_**")
+- Weibull adstock transformations have **_:red[flexible decay]_**"
+
+GEOMETRIC_INTRO_MD = "___Geometric adstock is the simplest adstock function, it depends on a single parameter $\\beta > 0$ which represents the fixed-rate decay.___ \n \
+                \n __The geometric adstock function takes the following form :__"
+
+TYPICAL_GEOMETRIC_VALUES_MD = "**Typical values for geometric adstock:** \n \
+- TV: **:blue[0.3 - 0.8]** - _decays slowly_ \n \
+- OOH/Print/Radio:  **:blue[0.1 - 0.4]** - _decays moderately_ \n \
+- Digital:  **:blue[0.0 - 0.3]** - _decays quickly_ \n"
+
+DELAYED_GEOMETRIC_INTRO_MD = "___Delayed geometric adstock builds on geometric adstock___ \
+                 ___by adding in a delay $\\theta$ before the maximum adstock is observed (this happens at week 0 for the plain geometric decay).___ \
+                \n ___It also adds a maximum duration for the carryover/adstock  $L_{max}$,  such that adstock after this point is 0.___ \n \
+                \n __The delayed geometric adstock function takes the following form :__"
+
+WEIBULL_CDF_INTRO_MD = "___The Weibull CDF is a function depending on two variables, $k$ (known as the **shape**) and $\lambda$ (known as the **scale**)___.  \n  \
+                The idea is closely related to geometric adstock but with one important difference : the rate of decay (what we called $\\beta$ in the geometric adstock equation)  \
+                 is no longer fixed. Instead it’s **time-dependent**. \
+                \n \n **The Weibull CDF adstock function therefore takes the form :**"
+
+WEIBULL_PDF_INTRO_MD = "___The Weibull PDF is also a function depending on two variables, $k$ (shape) and $\lambda$ (scale) \
+                 and the same remarks for Weibull CDF apply to Weibull PDF.___ \
+                \n The key difference is that Weibull PDF \
+                 allows for lagged effects to be taken into account - the **time delay effect**. \
+                \n \n **The Weibull PDF adstock function therefore takes the form :**"
+
+# -------------------------- DATA FUNCTIONS -------------------------
+
+def format_adstock_labels(adstock_values):
+    """
+    Format adstock values as rounded, comma-separated labels for neater plotting.
+
+    Parameters:
+        adstock_values (array-like): Adstock values to label.
+
+    Returns:
+        np.array: Array of label strings, one per adstock value.
+    """
+    return pd.Series(adstock_values).map('{:,.0f}'.format).to_numpy()
+
+@st.cache_data(max_entries=64)
+def make_weibull_adstock_df(impact, shapes, scales, periods, adstock_type):
+    """
+    Build the long-form df of Weibull adstock values to plot, one line per shape/scale pair.
+    Cached so that reruns which only change plot options reuse the same df.
+
+    Parameters:
+        impact (float): Initial advertising impact.
+        shapes (list): Shape parameter of each line.
+        scales (list): Scale parameter of each line.
+        periods (int): Number of periods.
+        adstock_type (str): Type of adstock ('cdf' or 'pdf').
+
+    Returns:
+        pd.DataFrame: Df with Week, Adstock, Line and Adstock Labels columns.
+    """
+    n_lines = len(shapes)
+    # Fill a single pre-allocated array with each line's values, rather than concatenating dfs
+    adstock_values = np.empty(n_lines * periods)
+    for i, (shape, scale) in enumerate(zip(shapes, scales)):
+        # Calculate weibull adstock values, decayed over time
+        adstock_values[i * periods:(i + 1) * periods] = weibull_adstock_decay(impact, shape, scale, periods,
+                                                                              adstock_type=adstock_type,
+                                                                              normalised=True)
+    # Create df of adstock values, to plot with
+    weibull_df = pd.DataFrame({"Week": np.tile(np.arange(1, periods + 1, dtype=np.int32), n_lines),
+                               "Adstock": adstock_values,
+                               "Line": np.repeat(np.array(["Line A", "Line B"][:n_lines], dtype=object), periods),
+                               ## Format adstock labels for neater plotting
+                               "Adstock Labels": format_adstock_labels(adstock_values)},
+                              copy=False)
+    return weibull_df
+
+# -------------------------- PLOTTING FUNCTIONS -------------------------
+
+@st.cache_data(max_entries=64)
+def make_adstock_figure(adstock_df, color_column, color_map, annotate, title):
+    """
+    Build the line plot of adstock values decayed over weeks.
+    Cached so that reruns with unchanged data and options skip figure construction.
+
+    Parameters:
+        adstock_df (pd.DataFrame): Long-form df with Week, Adstock and Adstock Labels columns.
+        color_column (str): Column used to split the df into separate lines.
+        color_map (dict): Mapping of values in color_column to line colours.
+        annotate (bool): If True, shows the adstock labels directly on the plot.
+        title (str): Title of the plot.
+
+    Returns:
+        plotly.graph_objects.Figure: Formatted adstock plot.
+    """
+    fig = go.Figure()
+    # Add one line per value in color_column, in the order of the colour mapping
+    for name, color in color_map.items():
+        line_df = adstock_df[adstock_df[color_column] == name]
+        if line_df.empty:
+            continue
+        # Match the hover text px.line gave, including the labels when annotated
+        hovertemplate = f"{color_column}={name}<br>Week=%{{x}}<br>Adstock=%{{y}}"
+        if annotate:
+            hovertemplate += "<br>Adstock Labels=%{text}"
+        fig.add_trace(go.Scatter(x = line_df['Week'],
+                                 y = line_df['Adstock'],
+                                 mode = 'lines+markers+text' if annotate else 'lines+markers',
+                                 text = line_df['Adstock Labels'] if annotate else None,
+                                 textposition = "bottom left",
+                                 hovertemplate = hovertemplate + "<extra></extra>",
+                                 name = name,
+                                 # Keep the legend even when only one line is plotted
+                                 showlegend = True,
+                                 line = dict(color=color)))
+    # Format plot
+    fig.update_layout(title_text=title, 
+                    title_font = dict(size = 30),
+                    xaxis_title='Week',
+                    yaxis_title='Adstock',
+                    legend_title_text=color_column,
+                    height=600, width=1000)
+    return fig
+
+# -------------------------- TOP OF PAGE INFORMATION -------------------------
+
+# Set browser / tab config
+st.set_page_config(
+    page_title="MMM App - Adstock Transformations",
+    page_icon="🧊",
+)
+
+# Give some context for what the page displays
+st.title('Adstock Transformations')
+st.markdown(PAGE_INTRO_MD)
+
+st.markdown(DECAY_REMINDER_MD)
 
 # Starting value for adstock
 initial_impact = 100
 
-# Separate the adstock transformations into 3 tabs
-tab1, tab2, tab3, tab4 = st.tabs(["Geometric", "Delayed Geometric", "Weibull CDF", "Weibull PDF"])
+# Separate the adstock transformations into 4 views
+# Only the selected view is run, unlike st.tabs which runs every tab on each rerun
+adstock_view = st.radio("View", ["Geometric", "Delayed Geometric", "Weibull CDF", "Weibull PDF"],
+                        horizontal=True)
 
 # -------------------------- GEOMETRIC ADSTOCK DISPLAY -------------------------
-with tab1:
+if adstock_view == "Geometric":
     st.header(':blue[Geometric Adstock Transformation]')
     st.divider()
-    st.markdown("___Geometric adstock is the simplest adstock function, it depends on a single parameter $\\beta > 0$ which represents the fixed-rate decay.___ \n \
-                \n __The geometric adstock function takes the following form :__")
+    st.markdown(GEOMETRIC_INTRO_MD)
     st.latex(r'''
         x_t^{\textrm{transf}} = x_t + \beta x_{t-1}^{\textrm{transf}}
         ''')
     st.divider()
-    st.markdown("**Typical values for geometric adstock:** \n \
-- TV: **:blue[0.3 - 0.8]** - _decays slowly_ \n \
-- OOH/Print/Radio:  **:blue[0.1 - 0.4]** - _decays moderately_ \n \
-- Digital:  **:blue[0.0 - 0.3]** - _decays quickly_ \n")
+    st.markdown(TYPICAL_GEOMETRIC_VALUES_MD)
     st.caption(":link: [Values taken from Meta's Analyst's Guide to MMM](https://facebookexperimental.github.io/Robyn/docs/analysts-guide-to-MMM/#feature-engineering)")
 
     # User inputs
     st.subheader(':blue[User Inputs]')
-    num_periods = st.slider('Number of weeks after impressions first received :alarm_clock:', 1, 100, 20, key = "Geometric")
-    # Let user choose decay rates to plot with
-    decay_rate_1 = st.slider(':blue[Beta 1 : ]', 0.0, 1.0, 0.3)
     # Add up to 2 more lines if the user wants it
     st.markdown('**Would you like to show multiple (3) decay lines on the plot**')
     multi_plot = st.checkbox('Okay! :grin:')
-    # Create a list of decay rates
-    if multi_plot:
-        # Let user choose additional decay rates to plot with
-        decay_rate_2 = st.slider(':red[Beta 2 : ]', 0.0, 1.0, 0.6)
-        decay_rate_3 = st.slider(':green[Beta 3: ]', 0.0, 1.0, 0.9)
-        decay_rates = [decay_rate_1, decay_rate_2, decay_rate_3]
-    else:
-        decay_rates = [decay_rate_1]
-
-    # Create df to store each adstock in
-    all_adstocks = pd.DataFrame()
-    # Iterate through decay rates and generate df of values to plot
-    for i, beta in enumerate(decay_rates):
-        # Get geometric adstock values, decayed over time
-        adstock_df = pd.DataFrame({"Week": range(1, (num_periods + 1)),
-                                ## Calculate adstock values
-                                    "Adstock": geometric_adstock_decay(initial_impact, beta, num_periods),
-                                    ## Format adstock labels for neater plotting
-                                "Adstock Labels": [f'{x:,.0f}' for x in geometric_adstock_decay(initial_impact, beta, num_periods)], 
-                                    ## Create column to label each adstock
-                                    "Beta": f"Beta {i + 1}"})
-
-        all_adstocks = pd.concat([all_adstocks, adstock_df])
+    # Batch slider changes so the page only reruns when the user submits them
+    with st.form("geom_form"):
+        num_periods = st.slider('Number of weeks after impressions first received :alarm_clock:', 1, 100, 20, key = "Geometric")
+        # Let user choose decay rates to plot with
+        decay_rate_1 = st.slider(':blue[Beta 1 : ]', 0.0, 1.0, 0.3)
+        # Create a list of decay rates
+        if multi_plot:
+            # Let user choose additional decay rates to plot with
+            decay_rate_2 = st.slider(':red[Beta 2 : ]', 0.0, 1.0, 0.6)
+            decay_rate_3 = st.slider(':green[Beta 3: ]', 0.0, 1.0, 0.9)
+            decay_rates = [decay_rate_1, decay_rate_2, decay_rate_3]
+        else:
+            decay_rates = [decay_rate_1]
+        st.form_submit_button("Update")
+
+    # Get geometric adstock values for all decay rates at once, one row per beta
+    adstock_values = geometric_adstock_decay(initial_impact, decay_rates, num_periods)
+    # Reshape into a long df of values to plot
+    all_adstocks = pd.DataFrame({"Week": np.tile(np.arange(1, num_periods + 1, dtype=np.int32), len(decay_rates)),
+                                 "Adstock": adstock_values.ravel(),
+                                 ## Create column to label each adstock
+                                 "Beta": np.repeat(np.array([f"Beta {i + 1}" for i in range(len(decay_rates))], dtype=object),
+                                                   num_periods)},
+                                copy=False)
+    # Format adstock labels for neater plotting
+    all_adstocks["Adstock Labels"] = format_adstock_labels(all_adstocks.Adstock)
 
     # Plot adstock values
     # Annotate the plot if user wants it
     st.markdown('**Would you like to show the adstock values directly on the plot?**')
     annotate = st.checkbox('Yes please! :pray:', key = "Geometric Annotate")
-    if annotate:
-        fig = px.line(all_adstocks, x = 'Week',
-                y = 'Adstock', text = 'Adstock Labels',
-                markers=True, color = "Beta",
-                # Replaces default color mapping by value
-                color_discrete_map={"Beta 1": "#636EFA",
-                                        "Beta 2": "#EF553B",
-                                        "Beta 3": "#00CC96"})
-        fig.update_traces(textposition="bottom left")
-    else:
-        fig = px.line(all_adstocks, x = 'Week',
-                y = 'Adstock',
-                markers=True, color = "Beta",
-                # Replaces default color mapping by value
-                color_discrete_map={"Beta 1": "#636EFA",
-                                        "Beta 2": "#EF553B",
-                                        "Beta 3": "#00CC96"})
-    # Format plot
-    fig.layout.height = 600
-    fig.layout.width = 1000
-    fig.update_layout(title_text="Geometric Adstock Decayed Over Weeks", 
-                    title_font = dict(size = 30))
+    fig = make_adstock_figure(all_adstocks, color_column = "Beta",
+                              # Replaces default color mapping by value
+                              color_map = {"Beta 1": "#636EFA",
+                                           "Beta 2": "#EF553B",
+                                           "Beta 3": "#00CC96"},
+                              annotate = annotate,
+                              title = "Geometric Adstock Decayed Over Weeks")
     st.plotly_chart(fig, theme="streamlit", use_container_width=False)
 
 # -------------------------- DELAYED GEOMETRIC ADSTOCK DISPLAY -------------------------
-with tab2:
+if adstock_view == "Delayed Geometric":
     st.header(':red[Delayed Geometric Adstock Transformation]')
     st.divider()
-    st.markdown("___Delayed geometric adstock builds on geometric adstock___ \
-                 ___by adding in a delay $\\theta$ before the maximum adstock is observed (this happens at week 0 for the plain geometric decay).___ \
-                \n ___It also adds a maximum duration for the carryover/adstock  $L_{max}$,  such that adstock after this point is 0.___ \n \
-                \n __The delayed geometric adstock function takes the following form :__")
+    st.markdown(DELAYED_GEOMETRIC_INTRO_MD)
     st.latex(r'''
         x_t^{\textrm{transf}} = \sum_{i=0}^{L_{\max}-1} \left( \beta^{|i-\theta|} \cdot x_{t-i} \right) \\''')
     st.markdown("- $x_t^{\\textrm{transf}}$ refers to the transformed value at time $t$ after applying the delayed adstock transformation")
@@ -130,96 +236,76 @@ with tab2:
     st.markdown("- $\\theta$ represents the delay before the peak effect occurs")
     st.markdown("- $L_{max}$ is the maximum duration of the carryover effect")
     st.divider()
-    st.markdown("**Typical values for geometric adstock:** \n \
-- TV: **:blue[0.3 - 0.8]** - _decays slowly_ \n \
-- OOH/Print/Radio:  **:blue[0.1 - 0.4]** - _decays moderately_ \n \
-- Digital:  **:blue[0.0 - 0.3]** - _decays quickly_ \n")
+    st.markdown(TYPICAL_GEOMETRIC_VALUES_MD)
     st.caption(":link: [Values taken from Meta's Analyst's Guide to MMM](https://facebookexperimental.github.io/Robyn/docs/analysts-guide-to-MMM/#feature-engineering)")
 
     # User inputs
     st.subheader(':red[User Inputs]')
-    max_lag = st.slider('Number of weeks after impressions first received :alarm_clock: : ', 1, 100, 30, key = "Delayed Geometric")
-    max_peak = st.slider(':red[Number of weeks after impressions first received that max impact occurs :thermometer: : ]', 0, 100, 10, key = "delayed_geom_L")
-    # Let user choose decay rates to plot with
-    decay_rate_1 = st.slider(':red[Beta 1: ]', 0.0, 1.0, 0.5, key="delay_decay")
-
     # Add up to 2 more lines if the user wants it
     st.markdown('**Would you like to show multiple (3) decay lines on the plot**')
     multi_plot = st.checkbox('Okay! :grin:', key = "Delay Geom Multi")
-    # Create a list of decay rates
-    if multi_plot:
-        # Let user choose additional decay rates, lags and peaks to plot with
-        decay_rate_2 = st.slider(':blue[Beta 2: ]', 0.0, 1.0, 0.6, key="delay_decay2")
-        max_peak_2 = st.slider(':blue[Number of weeks after impressions first received that max impact occurs :thermometer: :]', 1, 100, 5, key = "delayed_geom_L 2")
-        max_lag_2 = st.slider(':blue[Number of weeks after impressions first received :alarm_clock: : ]', 1, 100, 20, key = "Delayed Geometric 2 ")
-        decay_rate_3 = st.slider(':green[Beta 3: ]', 0.0, 1.0, 0.9, key="delay_decay3")
-        max_lag_3 = st.slider(':green[Number of weeks after impressions first received :alarm_clock: : ]', 1, 100, 20, key = "Delayed Geometric 3 ")
-        max_peak_3 = st.slider(':green[Number of weeks after impressions first received that max impact occurs :thermometer: :]', 1, 100, 5, key = "delayed_geom_L 3")
-
-        # Put in lists to iterate through later
-        decay_rates = [decay_rate_1, decay_rate_2, decay_rate_3]
-        lags = [max_lag, max_lag_2, max_lag_3]        
-        peaks = [max_peak, max_peak_2, max_peak_3]
-
-    else:
-        decay_rates = [decay_rate_1]
-        lags = [max_lag]
-        peaks = [max_peak]
-
-    # Create df to store each adstock in
-    all_adstocks = pd.DataFrame()
-    # Iterate through decay rates and generate df of values to plot
-    for i, beta in enumerate(decay_rates):
-        # Get geometric adstock values, decayed over time
-        adstock_df = pd.DataFrame({"Week": range(1, (lags[i] + 1)),
-                                ## Calculate adstock values
-                                    "Adstock": delayed_geometric_decay(impact = initial_impact,
-                                                                       decay_factor = beta,
-                                                                        theta = peaks[i],
-                                                                        L = lags[i]),
-                                    ## Format adstock labels for neater plotting
-                                "Adstock Labels": [f'{x:,.0f}' for x in delayed_geometric_decay(initial_impact, beta, peaks[i], lags[i])], 
-                                    ## Create column to label each adstock
-                                    "Beta": f"Beta {i + 1}"})
-
-        all_adstocks = pd.concat([all_adstocks, adstock_df])
+    # Batch slider changes so the page only reruns when the user submits them
+    with st.form("delayed_geom_form"):
+        max_lag = st.slider('Number of weeks after impressions first received :alarm_clock: : ', 1, 100, 30, key = "Delayed Geometric")
+        max_peak = st.slider(':red[Number of weeks after impressions first received that max impact occurs :thermometer: : ]', 0, 100, 10, key = "delayed_geom_L")
+        # Let user choose decay rates to plot with
+        decay_rate_1 = st.slider(':red[Beta 1: ]', 0.0, 1.0, 0.5, key="delay_decay")
+
+        # Create a list of decay rates
+        if multi_plot:
+            # Let user choose additional decay rates, lags and peaks to plot with
+            decay_rate_2 = st.slider(':blue[Beta 2: ]', 0.0, 1.0, 0.6, key="delay_decay2")
+            max_peak_2 = st.slider(':blue[Number of weeks after impressions first received that max impact occurs :thermometer: :]', 1, 100, 5, key = "delayed_geom_L 2")
+            max_lag_2 = st.slider(':blue[Number of weeks after impressions first received :alarm_clock: : ]', 1, 100, 20, key = "Delayed Geometric 2 ")
+            decay_rate_3 = st.slider(':green[Beta 3: ]', 0.0, 1.0, 0.9, key="delay_decay3")
+            max_lag_3 = st.slider(':green[Number of weeks after impressions first received :alarm_clock: : ]', 1, 100, 20, key = "Delayed Geometric 3 ")
+            max_peak_3 = st.slider(':green[Number of weeks after impressions first received that max impact occurs :thermometer: :]', 1, 100, 5, key = "delayed_geom_L 3")
+
+            # Put in lists to iterate through later
+            decay_rates = [decay_rate_1, decay_rate_2, decay_rate_3]
+            lags = [max_lag, max_lag_2, max_lag_3]        
+            peaks = [max_peak, max_peak_2, max_peak_3]
+
+        else:
+            decay_rates = [decay_rate_1]
+            lags = [max_lag]
+            peaks = [max_peak]
+        st.form_submit_button("Update")
+
+    # Get delayed geometric adstock values for all decay rates at once, one row per beta
+    adstock_values = delayed_geometric_decay(impact = initial_impact,
+                                             decay_factor = decay_rates,
+                                             theta = peaks,
+                                             L = lags)
+    # Reshape into a long df of values to plot, dropping the padding after each beta's max lag
+    all_adstocks = pd.DataFrame({"Week": np.tile(np.arange(1, max(lags) + 1, dtype=np.int32), len(decay_rates)),
+                                 "Adstock": adstock_values.ravel(),
+                                 ## Create column to label each adstock
+                                 "Beta": np.repeat(np.array([f"Beta {i + 1}" for i in range(len(decay_rates))], dtype=object),
+                                                   max(lags))},
+                                copy=False)
+    all_adstocks = all_adstocks.dropna(subset=["Adstock"]).reset_index(drop=True)
+    # Format adstock labels for neater plotting
+    all_adstocks["Adstock Labels"] = format_adstock_labels(all_adstocks.Adstock)
 
     # Plot adstock values
     # Annotate the plot if user wants it
     st.markdown('**Would you like to show the adstock values directly on the plot?**')
     annotate = st.checkbox('Yes please! :pray:', key = "Delayed Geometric Annotate")
-    if annotate:
-        fig = px.line(all_adstocks, x = 'Week',
-                y = 'Adstock', text = 'Adstock Labels',
-                markers=True, color = "Beta",
-                # Replaces default color mapping by value
-                color_discrete_map={"Beta 1": "#636EFA",
-                                        "Beta 2": "#EF553B",
-                                        "Beta 3": "#00CC96"})
-        fig.update_traces(textposition="bottom left")
-    else:
-        fig = px.line(all_adstocks, x = 'Week',
-                y = 'Adstock',
-                markers=True, color = "Beta",
-                # Replaces default color mapping by value
-                color_discrete_map={"Beta 1": "#636EFA",
-                                        "Beta 2": "#EF553B",
-                                        "Beta 3": "#00CC96"})
-    # Format plot
-    fig.layout.height = 600
-    fig.layout.width = 1000
-    fig.update_layout(title_text="Delayed Geometric Adstock Decayed Over Weeks", 
-                    title_font = dict(size = 30))
+    fig = make_adstock_figure(all_adstocks, color_column = "Beta",
+                              # Replaces default color mapping by value
+                              color_map = {"Beta 1": "#636EFA",
+                                           "Beta 2": "#EF553B",
+                                           "Beta 3": "#00CC96"},
+                              annotate = annotate,
+                              title = "Delayed Geometric Adstock Decayed Over Weeks")
     st.plotly_chart(fig, theme="streamlit", use_container_width=False)
 
 # -------------------------- WEIBULL CDF ADSTOCK DISPLAY -------------------------
-with tab3:
+if adstock_view == "Weibull CDF":
     st.header(':green[Weibull CDF Adstock Transformation]')
     st.divider()
-    st.markdown("___The Weibull CDF is a function depending on two variables, $k$ (known as the **shape**) and $\lambda$ (known as the **scale**)___.  \n  \
-                The idea is closely related to geometric adstock but with one important difference : the rate of decay (what we called $\\beta$ in the geometric adstock equation)  \
-                 is no longer fixed. Instead it’s **time-dependent**. \
-                \n \n **The Weibull CDF adstock function therefore takes the form :**")
+    st.markdown(WEIBULL_CDF_INTRO_MD)
     st.latex(r'''
         x_t^{\textrm{transf}} = x_t + \beta_t x_{t-1}^{\textrm{transf}}''')
     st.markdown('- where $\\beta_t$ is now a function of time $t$')
@@ -232,90 +318,54 @@ with tab3:
     st.divider()
     # User inputs
     st.subheader(':green[User Inputs]')
-    num_periods_2 = st.slider('Number of weeks after impressions first received :alarm_clock: :',
-                               1, 100, 20, key = "Weibull CDF Periods")
-    # Let user choose shape and scale parameters to compare two Weibull PDF decay curves simultaneously
-    # Params for Line A
-    shape_parameter_A = st.slider(':triangular_ruler: :green[Shape $k$ of Line A]:', 
-                                  0.0, 10.0, 0.1, key = "Weibull CDF Shape A")
-    scale_parameter_A = st.slider(':green[Scale $\lambda$ of Line A]:',
-                                   0.0, 1.0, 0.1, key = "Weibull CDF Scale A")
-    
-    # Calculate weibull pdf adstock values, decayed over time for both sets of params
-    adstock_series_A = weibull_adstock_decay(initial_impact, shape_parameter_A,
-                                                  scale_parameter_A, num_periods_2,
-                                                  adstock_type='cdf', normalised=True)
-    
-    # Create df of adstock values, to plot with
-    adstock_df_A = pd.DataFrame({"Week": range(1, (num_periods_2 + 1)),
-                                "Adstock": adstock_series_A,
-                                "Line": "Line A"})
-    
-    # Create plotting df
-    weibull_pdf_df = adstock_df_A.copy()
-    
     # Plot 2nd line if user desires values
     st.markdown('**Would you like to add a second line to the plot?**')
     second_cdf = st.checkbox('Okay! :grin:', key = "Add 2nd Weibull CDF")
 
-    if second_cdf:
-        # Params for Line B
-        shape_parameter_B = st.slider(':triangular_ruler: :red[Shape $k$ of Line B : ]', 
-                                    0.0, 10.0, 9.0, key = "Weibull CDF Shape B")
-        scale_parameter_B = st.slider(':red[Scale $\lambda$ of Line B : ]', 
-                                    0.0, 1.0, 0.5, key = "Weibull CDF Scale B")
-        # Calculate weibull pdf adstock values, decayed over time for both sets of params
-        adstock_series_B = weibull_adstock_decay(initial_impact, shape_parameter_B,
-                                                    scale_parameter_B, num_periods_2,
-                                                    adstock_type='cdf', normalised=True)
-
-        # Create df of adstock values, to plot with
-        adstock_df_B = pd.DataFrame({"Week": range(1, (num_periods_2 + 1)),
-                                    "Adstock": adstock_series_B,
-                                    "Line": "Line B"})
-        # Create plotting df
-        weibull_pdf_df = pd.concat([adstock_df_A, adstock_df_B])
-
-    # Multiply by 100 to get back to scale of initial impact (100 FB impressions)
-    weibull_pdf_df.Adstock = weibull_pdf_df.Adstock
-    # Format adstock labels for neater plotting
-    weibull_pdf_df["Adstock Labels"] = weibull_pdf_df.Adstock.map('{:,.0f}'.format)
+    # Batch slider changes so the page only reruns when the user submits them
+    with st.form("weibull_cdf_form"):
+        num_periods_2 = st.slider('Number of weeks after impressions first received :alarm_clock: :',
+                                   1, 100, 20, key = "Weibull CDF Periods")
+        # Let user choose shape and scale parameters to compare two Weibull PDF decay curves simultaneously
+        # Params for Line A
+        shape_parameter_A = st.slider(':triangular_ruler: :green[Shape $k$ of Line A]:', 
+                                      0.0, 10.0, 0.1, key = "Weibull CDF Shape A")
+        scale_parameter_A = st.slider(':green[Scale $\lambda$ of Line A]:',
+                                       0.0, 1.0, 0.1, key = "Weibull CDF Scale A")
+        shapes = [shape_parameter_A]
+        scales = [scale_parameter_A]
+
+        if second_cdf:
+            # Params for Line B
+            shape_parameter_B = st.slider(':triangular_ruler: :red[Shape $k$ of Line B : ]', 
+                                        0.0, 10.0, 9.0, key = "Weibull CDF Shape B")
+            scale_parameter_B = st.slider(':red[Scale $\lambda$ of Line B : ]', 
+                                        0.0, 1.0, 0.5, key = "Weibull CDF Scale B")
+            shapes.append(shape_parameter_B)
+            scales.append(scale_parameter_B)
+        st.form_submit_button("Update")
+
+    # Calculate weibull cdf adstock values for each line, decayed over time
+    weibull_cdf_df = make_weibull_adstock_df(initial_impact, shapes, scales,
+                                             num_periods_2, adstock_type='cdf')
 
     # Plot adstock values
     # Annotate the plot if user wants it
     st.markdown('**Would you like to show the adstock values directly on the plot?**')
     annotate = st.checkbox('Yes please! :pray:', key = "Weibull CDF Annotate")
-    if annotate:
-        fig = px.line(weibull_pdf_df, x = 'Week',
-                y = 'Adstock', text = 'Adstock Labels',
-                markers=True, color = "Line",
-                # Replaces default color mapping by value
-                color_discrete_map={"Line A": "#636EFA",
-                                        "Line B": "#EF553B"})
-        fig.update_traces(textposition="bottom left")
-    else:
-        fig = px.line(weibull_pdf_df, x = 'Week',
-                y = 'Adstock',
-                markers=True, color = "Line",
-                # Replaces default color mapping by value
-                color_discrete_map={"Line A": "#636EFA",
-                                        "Line B": "#EF553B"})
-    # Format plot
-    fig.layout.height = 600
-    fig.layout.width = 1000
-    fig.update_layout(title_text="Weibull CDF Adstock Decayed Over Weeks", 
-                    title_font = dict(size = 30))
+    fig = make_adstock_figure(weibull_cdf_df, color_column = "Line",
+                              # Replaces default color mapping by value
+                              color_map = {"Line A": "#636EFA",
+                                           "Line B": "#EF553B"},
+                              annotate = annotate,
+                              title = "Weibull CDF Adstock Decayed Over Weeks")
     st.plotly_chart(fig, theme="streamlit", use_container_width=False)
 
 # -------------------------- WEIBULL PDF ADSTOCK DISPLAY -------------------------
-with tab4:
+if adstock_view == "Weibull PDF":
     st.header(':violet[Weibull PDF Adstock Transformation]')
     st.divider()
-    st.markdown("___The Weibull PDF is also a function depending on two variables, $k$ (shape) and $\lambda$ (scale) \
-                 and the same remarks for Weibull CDF apply to Weibull PDF.___ \
-                \n The key difference is that Weibull PDF \
-                 allows for lagged effects to be taken into account - the **time delay effect**. \
-                \n \n **The Weibull PDF adstock function therefore takes the form :**")
+    st.markdown(WEIBULL_PDF_INTRO_MD)
     st.latex(r'''
         x_t^{\textrm{transf}} = x_t + \beta_t x_{t-1}^{\textrm{transf}}''')
     st.markdown('- where $\\beta_t$ is now a function of time $t$')
@@ -326,78 +376,45 @@ with tab4:
 
     # User inputs
     st.subheader(':violet[User Inputs]')
-    num_periods_3 = st.slider('Number of weeks after impressions first received :alarm_clock: : ',
-                               1, 100, 20, key = "Weibull PDF Periods")
-    # Let user choose shape and scale parameters to compare two Weibull PDF decay curves simultaneously
-    # Params for Line A
-    shape_parameter_A = st.slider(':triangular_ruler: :blue[Shape $k$ of Line A : ]',
-                                   0.0, 10.0, 2.0, key = "Weibull PDF Shape A")
-    scale_parameter_A = st.slider(':blue[Scale $\lambda$ of Line A : ]', 
-                                  0.0, 1.0, 0.5, key = "Weibull PDF Scale A")
-    
-    # Calculate weibull pdf adstock values, decayed over time for both sets of params
-    adstock_series_A = weibull_adstock_decay(initial_impact, shape_parameter_A,
-                                                  scale_parameter_A, num_periods_3,
-                                                  adstock_type='pdf', normalised=True)  
-
-    # Create df of adstock values, to plot with
-    adstock_df_A = pd.DataFrame({"Week": range(1, (num_periods_3 + 1)),
-                                "Adstock": adstock_series_A,
-                                "Line": "Line A"})  
-    
-    # Create plotting df
-    weibull_pdf_df = adstock_df_A.copy()
-
     # Plot 2nd line if user desires values
     st.markdown('**Would you like to add a second line to the plot?**')
     second_pdf = st.checkbox('Okay! :grin:', key = "Add 2nd Weibull PDF")
 
-    if second_pdf:
-        # Params for Line B
-        shape_parameter_B = st.slider(':triangular_ruler: :red[Shape $k$ of Line B : ]',
-                                    0.0, 10.0, 0.5, key = "Weibull PDF Shape B")
-        scale_parameter_B = st.slider(':red[Scale $\lambda$ of Line B : ]', 
-                                    0.0, 1.0, 0.01, key = "Weibull PDF Scale B")
-
-        # Calculate weibull pdf adstock values, decayed over time for both sets of params
-        adstock_series_B = weibull_adstock_decay(initial_impact, shape_parameter_B,
-                                                    scale_parameter_B, num_periods_3,
-                                                    adstock_type='pdf', normalised=True)
-    
-        # Create df of adstock values, to plot with
-        adstock_df_B = pd.DataFrame({"Week": range(1, (num_periods_3 + 1)),
-                                    "Adstock": adstock_series_B,
-                                    "Line": "Line B"})
-        # Create plotting df
-        weibull_pdf_df = pd.concat([adstock_df_A, adstock_df_B])
-
-    # Multiply by 100 to get back to scale of initial impact (100 FB impressions)
-    weibull_pdf_df.Adstock = weibull_pdf_df.Adstock
-    # Format adstock labels for neater plotting
-    weibull_pdf_df["Adstock Labels"] = weibull_pdf_df.Adstock.map('{:,.0f}'.format)
+    # Batch slider changes so the page only reruns when the user submits them
+    with st.form("weibull_pdf_form"):
+        num_periods_3 = st.slider('Number of weeks after impressions first received :alarm_clock: : ',
+                                   1, 100, 20, key = "Weibull PDF Periods")
+        # Let user choose shape and scale parameters to compare two Weibull PDF decay curves simultaneously
+        # Params for Line A
+        shape_parameter_A = st.slider(':triangular_ruler: :blue[Shape $k$ of Line A : ]',
+                                       0.0, 10.0, 2.0, key = "Weibull PDF Shape A")
+        scale_parameter_A = st.slider(':blue[Scale $\lambda$ of Line A : ]', 
+                                      0.0, 1.0, 0.5, key = "Weibull PDF Scale A")
+        shapes = [shape_parameter_A]
+        scales = [scale_parameter_A]
+
+        if second_pdf:
+            # Params for Line B
+            shape_parameter_B = st.slider(':triangular_ruler: :red[Shape $k$ of Line B : ]',
+                                        0.0, 10.0, 0.5, key = "Weibull PDF Shape B")
+            scale_parameter_B = st.slider(':red[Scale $\lambda$ of Line B : ]', 
+                                        0.0, 1.0, 0.01, key = "Weibull PDF Scale B")
+            shapes.append(shape_parameter_B)
+            scales.append(scale_parameter_B)
+        st.form_submit_button("Update")
+
+    # Calculate weibull pdf adstock values for each line, decayed over time
+    weibull_pdf_df = make_weibull_adstock_df(initial_impact, shapes, scales,
+                                             num_periods_3, adstock_type='pdf')
 
     # Plot adstock values
     # Annotate the plot if user wants it
     st.markdown('**Would you like to show the adstock values directly on the plot?**')
     annotate = st.checkbox('Yes please! :pray:', key = "Weibull PDF Annotate")
-    if annotate:
-        fig = px.line(weibull_pdf_df, x = 'Week',
-                y = 'Adstock', text = 'Adstock Labels',
-                markers=True, color = "Line",
-                # Replaces default color mapping by value
-                color_discrete_map={"Line A": "#636EFA",
-                                        "Line B": "#EF553B"})
-        fig.update_traces(textposition="bottom left")
-    else:
-        fig = px.line(weibull_pdf_df, x = 'Week',
-                y = 'Adstock',
-                markers=True, color = "Line",
-                # Replaces default color mapping by value
-                color_discrete_map={"Line A": "#636EFA",
-                                        "Line B": "#EF553B"})
-    # Format plot
-    fig.layout.height = 600
-    fig.layout.width = 1000
-    fig.update_layout(title_text="Weibull PDF Adstock Decayed Over Weeks", 
-                    title_font = dict(size = 30))
+    fig = make_adstock_figure(weibull_pdf_df, color_column = "Line",
+                              # Replaces default color mapping by value
+                              color_map = {"Line A": "#636EFA",
+                                           "Line B": "#EF553B"},
+                              annotate = annotate,
+                              title = "Weibull PDF Adstock Decayed Over Weeks")
     st.plotly_chart(fig, theme="streamlit", use_container_width=False)
\ No newline at end of file
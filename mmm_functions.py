@@ -1,6 +1,5 @@
 import numpy as np
-from scipy.stats import weibull_min
-from sklearn.preprocessing import MinMaxScaler
+import streamlit as st
 
 # ------------------- SATURATION CURVE FUNCTIONS ------------------------
 
@@ -97,52 +96,86 @@ def michaelis_menten_saturation(x, alpha, lam):
 
 # ------------------- ADSTOCK TRANSFORMATION FUNCTIONS ------------------------
 
+@st.cache_data(max_entries=256)
 def geometric_adstock_decay(impact, decay_factor, periods):
     """
     Calculate the geometric adstock effect.
+    Passing several decay factors computes all of their curves in one go.
 
     Parameters:
         impact (float): Initial advertising impact.
-        decay_factor (float): Decay factor between 0 and 1.
+        decay_factor (float or array-like): Decay factor(s) between 0 and 1.
         periods (int): Number of periods.
 
     Returns:
-        list: List of adstock values for each period.
-    """
-    adstock_values = [impact]
-    
-    for _ in range(1, periods):
-        impact *= decay_factor
-        adstock_values.append(impact)
+        np.array: Array of adstock values for each period,
+                  with one row per decay factor if several are given.
+    """
+    decay_factor = np.asarray(decay_factor, dtype=float)
+    # Decay is applied from the second period onwards, so cumulative product gives beta^t
+    decay_values = np.empty(decay_factor.shape + (periods,))
+    decay_values[...] = decay_factor[..., None]
+    decay_values[..., 0] = 1.0
+    adstock_values = impact * np.cumprod(decay_values, axis=-1)
     
     return adstock_values
 
+@st.cache_data(max_entries=256)
 def delayed_geometric_decay(impact, decay_factor, theta, L):
     """
     Calculate the geometric adstock effect with a delayed peak and a specified maximum lag length.
+    Passing several decay factors, peaks and lag lengths computes all of their curves in one go.
     
     Parameters:
         impact (float): Peak advertising impact.
-        decay_factor (float): Decay factor between 0 and 1, applied throughout.
-        theta (int): Period at which peak impact occurs.
-        L (int): Maximum lag length for adstock effect.
+        decay_factor (float or array-like): Decay factor(s) between 0 and 1, applied throughout.
+        theta (int or array-like): Period(s) at which peak impact occurs.
+        L (int or array-like): Maximum lag length(s) for adstock effect.
         
     Returns:
-        np.array: Array of adstock values for each lag up to L.
-    """
-    adstock_values = np.zeros(L)
-    
-    # Calculate adstock values
-    for lag in range(L):
-        if lag < theta:
-            # Before peak, apply decay to grow towards peak
-            adstock_values[lag] = impact * (decay_factor ** abs(lag - theta))
-        else:
-            # After peak, apply decay normally
-            adstock_values[lag] = impact * (decay_factor ** abs(lag - theta))
+        np.array: Array of adstock values for each lag up to L,
+                  with one row per curve if several are given. Rows shorter
+                  than the longest L are padded with NaN.
+    """
+    decay_factor, theta, L = (np.asarray(param)[..., None] for param in (decay_factor, theta, L))
+    # Decay grows towards the peak before theta and decays normally after it
+    lags = np.arange(L.max(), dtype=float)
+    adstock_values = impact * np.power(decay_factor, np.abs(lags - theta))
+    # Pad lags beyond each curve's maximum lag length
+    adstock_values = np.where(lags < L, adstock_values, np.nan)
     
     return adstock_values
 
+@st.cache_data(max_entries=256)
+def _weibull_core(shape, scale, periods):
+    """
+    Calculate the Weibull PDF and survival function (1 - CDF) over each period in one pass.
+    Both Weibull adstock types are built from these, so they share the cached result.
+
+    Parameters:
+        shape (float): Shape parameter of the Weibull distribution, must be non-zero.
+        scale (float): Scale parameter of the Weibull distribution, as a percentile of the periods.
+        periods (int): Number of periods.
+
+    Returns:
+        tuple: Arrays of Weibull PDF and survival values for each period.
+    """
+    # Create an array of time periods
+    x_bin = np.arange(1, periods + 1)
+
+    # Transform the scale parameter according to percentile of time period
+    # (the quantile of 1..periods is a linear interpolation, so no sort is needed)
+    transformed_scale = max(1, int(round(1 + scale * (periods - 1))))
+
+    # Survival function 1 - F(t) = exp(-(t/scale)^shape)
+    scaled_x = x_bin / transformed_scale
+    survival = np.exp(-scaled_x ** shape)
+    # PDF (k/scale) * (t/scale)^(k-1) * exp(-(t/scale)^k), reusing the exponential term
+    pdf = (shape / transformed_scale) * scaled_x ** (shape - 1) * survival
+
+    return pdf, survival
+
+@st.cache_data(max_entries=256)
 def weibull_adstock_decay(impact, shape, scale, periods, adstock_type='cdf', normalised=True):
     """
     Calculate the Weibull PDF or CDF adstock decay for media mix modeling.
@@ -153,37 +186,34 @@ def weibull_adstock_decay(impact, shape, scale, periods, adstock_type='cdf', nor
         scale (float): Scale parameter of the Weibull distribution.
         periods (int): Number of periods.
         adstock_type (str): Type of adstock ('cdf' or 'pdf').
-        normalise (bool): If True, normalises decay values between 0 and 1,
+        normalised (bool): If True, normalises decay values between 0 and 1,
                         otherwise leaves unnormalised.
 
     Returns:
-        list: List of adstock-decayed values for each period.
+        np.array: Array of adstock-decayed values for each period.
     """
-    # Create an array of time periods
-    x_bin = np.arange(1, periods + 1)
-
-    # Transform the scale parameter according to percentile of time period
-    transformed_scale = round(np.quantile(x_bin, scale))
-
     # Handle the case when shape or scale is 0
     if shape == 0 or scale == 0:
         theta_vec_cum = np.zeros(periods)
     else:
+        # PDF and survival values are shared between both adstock types
+        pdf, survival = _weibull_core(shape, scale, periods)
         if adstock_type.lower() == 'cdf':
-            # Calculate the Weibull adstock decay using CDF
-            theta_vec = np.concatenate(([1], 1 - weibull_min.cdf(x_bin[:-1], shape, scale=transformed_scale)))
+            # Calculate the Weibull adstock decay using CDF, via the survival function 1 - F(t)
+            theta_vec = np.concatenate(([1.0], survival[:-1]))
             theta_vec_cum = np.cumprod(theta_vec)
         elif adstock_type.lower() == 'pdf':
             # Calculate the Weibull adstock decay using PDF
-            theta_vec_cum = weibull_min.pdf(x_bin, shape, scale=transformed_scale)
-            theta_vec_cum /= np.sum(theta_vec_cum)
+            theta_vec_cum = pdf / np.sum(pdf)
     
     # Return adstock decay values, normalized or not
     if normalised:
         # Normalize the values between 0 and 1 using Min-Max scaling
-        norm_theta_vec_cum = MinMaxScaler().fit_transform(theta_vec_cum.reshape(-1, 1)).flatten()
-        # Scale by initial impact variable
-        return norm_theta_vec_cum * impact
-    else:
-        # Scale by initial impact variable
-        return theta_vec_cum * impact
\ No newline at end of file
+        min_theta, max_theta = theta_vec_cum.min(), theta_vec_cum.max()
+        if max_theta > min_theta:
+            theta_vec_cum = (theta_vec_cum - min_theta) / (max_theta - min_theta)
+        else:
+            theta_vec_cum = np.zeros_like(theta_vec_cum)
+    
+    # Scale by initial impact variable
+    return theta_vec_cum * impact
\ No newline at end of file